@@ -11,3 +11,4 @@ mod tools;
 
 pub use approval::{ApprovalChannel, ApprovalEvent};
 pub use server::McpSshService;
+pub(crate) use server::strip_ansi_codes;
@@ -9,7 +9,7 @@ use rmcp::model::{CallToolResult, Content, Tool};
 use schemars::JsonSchema;
 use serde::{Deserialize, Serialize};
 use serde_json::{json, Map, Value};
-use std::sync::Arc;
+use std::sync::{Arc, LazyLock};
 use std::time::Duration;
 use tokio::sync::{Mutex, RwLock};
 use uuid::Uuid;
@@ -17,7 +17,7 @@ use uuid::Uuid;
 /// Shared SSH session state for MCP tools.
 pub struct SshState {
     pub session: Option<Arc<Mutex<SshSession>>>,
-    output_buffer: Arc<RwLock<Vec<String>>>,
+    output_buffer: Arc<RwLock<Vec<Arc<str>>>>,
 }
 
 impl SshState {
@@ -29,7 +29,7 @@ impl SshState {
     }
 
     /// Add output to the buffer.
-    pub async fn add_output(&self, output: String) {
+    pub async fn add_output(&self, output: Arc<str>) {
         let mut buffer = self.output_buffer.write().await;
         buffer.push(output);
         // Keep buffer manageable
@@ -39,11 +39,11 @@ impl SshState {
         }
     }
 
-    /// Get recent output lines.
-    pub async fn get_recent_output(&self, lines: usize) -> Vec<String> {
+    /// Get recent output entries concatenated, along with the entry count.
+    pub async fn get_recent_output(&self, lines: usize) -> (String, usize) {
         let buffer = self.output_buffer.read().await;
         let start = buffer.len().saturating_sub(lines);
-        buffer[start..].to_vec()
+        (buffer[start..].concat(), buffer.len() - start)
     }
 }
 
@@ -120,10 +120,14 @@ fn default_format() -> String {
     "plain".to_string()
 }
 
-/// Strip ANSI escape codes from text
-fn strip_ansi_codes(text: &str) -> String {
-    let ansi_regex = regex::Regex::new(r"\x1B\[[0-9;]*[a-zA-Z]|\x1B\][^\x07]*\x07").unwrap();
-    ansi_regex.replace_all(text, "").replace('\r', "")
+/// Matches ANSI escape sequences (compiled once on first use).
+static ANSI_REGEX: LazyLock<regex::Regex> = LazyLock::new(|| {
+    regex::Regex::new(r"\x1B\[[0-9;]*[a-zA-Z]|\x1B\][^\x07]*\x07").unwrap()
+});
+
+/// Strip ANSI escape codes from text.
+pub(crate) fn strip_ansi_codes(text: &str) -> String {
+    ANSI_REGEX.replace_all(text, "").replace('\r', "")
 }
 
 // ============================================================================
@@ -338,7 +342,11 @@ impl McpSshService {
                         // Store in buffer
                         drop(ssh_guard);
                         drop(state);
-                        self.ssh_state.read().await.add_output(output.clone()).await;
+                        self.ssh_state
+                            .read()
+                            .await
+                            .add_output(Arc::from(output.as_str()))
+                            .await;
 
                         CallToolResult::success(vec![Content::text(format!(
                             "Command executed successfully.\nOutput:\n{}",
@@ -374,21 +382,19 @@ impl McpSshService {
         };
 
         let state = self.ssh_state.read().await;
-        let output = state.get_recent_output(params.lines).await;
+        let (raw_output, entry_count) = state.get_recent_output(params.lines).await;
 
-        if output.is_empty() {
+        if entry_count == 0 {
             CallToolResult::success(vec![Content::text(
                 "No recent SSH terminal output available. The SSH session may not have \
                  produced any output yet, or the buffer is empty.",
             )])
         } else {
-            let raw_output = output.join("");
-
             // Process output based on strip_ansi parameter
             let processed_output = if params.strip_ansi {
                 strip_ansi_codes(&raw_output)
             } else {
-                raw_output.clone()
+                raw_output
             };
 
             // Format output based on format parameter
@@ -396,15 +402,16 @@ impl McpSshService {
                 "structured" => {
                     // Return structured JSON with metadata
                     let lines: Vec<&str> = processed_output.lines().collect();
+                    let lowercase_output = processed_output.to_lowercase();
                     let structured = json!({
-                        "total_buffer_entries": output.len(),
+                        "total_buffer_entries": entry_count,
                         "line_count": lines.len(),
                         "output": processed_output,
                         "lines": lines,
-                        "contains_error": processed_output.to_lowercase().contains("error")
-                            || processed_output.to_lowercase().contains("failed")
-                            || processed_output.to_lowercase().contains("denied")
-                            || processed_output.to_lowercase().contains("not found"),
+                        "contains_error": lowercase_output.contains("error")
+                            || lowercase_output.contains("failed")
+                            || lowercase_output.contains("denied")
+                            || lowercase_output.contains("not found"),
                     });
                     CallToolResult::success(vec![Content::text(
                         serde_json::to_string_pretty(&structured).unwrap_or(processed_output),
@@ -430,3 +437,42 @@ impl McpSshService {
         self.ssh_state.clone()
     }
 }
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    #[tokio::test]
+    async fn test_recent_output_empty_buffer() {
+        let state = SshState::new();
+
+        let (output, count) = state.get_recent_output(50).await;
+
+        assert_eq!(output, "");
+        assert_eq!(count, 0);
+    }
+
+    #[tokio::test]
+    async fn test_recent_output_returns_tail_window() {
+        let state = SshState::new();
+        for chunk in ["one\n", "two\n", "three\n"] {
+            state.add_output(Arc::from(chunk)).await;
+        }
+
+        let (output, count) = state.get_recent_output(2).await;
+
+        assert_eq!(output, "two\nthree\n");
+        assert_eq!(count, 2);
+    }
+
+    #[tokio::test]
+    async fn test_recent_output_zero_lines() {
+        let state = SshState::new();
+        state.add_output(Arc::from("one\n")).await;
+
+        let (output, count) = state.get_recent_output(0).await;
+
+        assert_eq!(output, "");
+        assert_eq!(count, 0);
+    }
+}
@@ -14,7 +14,8 @@ pub type McpServices = Arc<RwLock<HashMap<Uuid, Arc<McpSshService>>>>;
 pub struct Session {
     pub id: Uuid,
     pub ssh_session: Option<Arc<Mutex<SshSession>>>,
-    pub ssh_output_buffer: Arc<RwLock<Vec<String>>>,
+    /// Recent SSH output chunks, shared with the MCP SSH state buffer
+    pub ssh_output_buffer: Arc<RwLock<Vec<Arc<str>>>>,
     /// Event-driven approval channel (replaces polling-based pending_commands)
     pub approval_channel: Arc<ApprovalChannel>,
     /// MCP service for this session
@@ -43,7 +44,10 @@ impl Session {
     }
 
     /// Add SSH terminal output to the buffer
-    pub async fn add_ssh_output(&self, output: String) {
+    pub async fn add_ssh_output(&self, output: &str) {
+        // Allocate the chunk once; both buffers hold a reference to it
+        let output: Arc<str> = Arc::from(output);
+
         let mut buffer = self.ssh_output_buffer.write().await;
         buffer.push(output.clone());
 
@@ -56,7 +60,7 @@ impl Session {
         // Also send to Gemini terminal if connected
         if let Some(tx) = &self.ssh_to_gemini_tx {
             let tx = tx.lock().await;
-            let _ = tx.send(output.clone());
+            let _ = tx.send(output.to_string());
         }
 
         // Also add to MCP SSH state for tool access
@@ -65,8 +69,12 @@ impl Session {
     }
 
     /// Get recent SSH output for Gemini context
-    pub async fn get_ssh_context(&self) -> Vec<String> {
-        self.ssh_output_buffer.read().await.clone()
+    ///
+    /// Returns the buffered output concatenated into one string, along with
+    /// the number of buffer entries it was built from.
+    pub async fn get_ssh_context(&self) -> (String, usize) {
+        let buffer = self.ssh_output_buffer.read().await;
+        (buffer.concat(), buffer.len())
     }
 
     /// Get the approval channel for this session.
@@ -136,3 +144,36 @@ impl AppState {
         self.mcp_services.clone()
     }
 }
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    #[tokio::test]
+    async fn test_ssh_context_empty_buffer() {
+        let session = Session::new(None);
+
+        let (context, total_entries) = session.get_ssh_context().await;
+
+        assert_eq!(context, "");
+        assert_eq!(total_entries, 0);
+    }
+
+    #[tokio::test]
+    async fn test_ssh_output_trimmed_in_both_buffers() {
+        let session = Session::new(None);
+        for i in 0..150 {
+            session.add_ssh_output(&format!("{}\n", i)).await;
+        }
+        let expected: String = (50..150).map(|i| format!("{}\n", i)).collect();
+
+        let (context, total_entries) = session.get_ssh_context().await;
+        assert_eq!(context, expected);
+        assert_eq!(total_entries, 100);
+
+        let ssh_state = session.get_mcp_service().get_ssh_state();
+        let (output, count) = ssh_state.read().await.get_recent_output(usize::MAX).await;
+        assert_eq!(output, expected);
+        assert_eq!(count, 100);
+    }
+}
@@ -15,7 +15,7 @@ use tokio_stream::wrappers::BroadcastStream;
 use uuid::Uuid;
 
 use crate::gemini::GeminiTerminal;
-use crate::mcp::ApprovalEvent;
+use crate::mcp::{strip_ansi_codes, ApprovalEvent};
 use crate::ssh::{SshConfig, SshSession};
 use crate::state::AppState;
 
@@ -77,6 +77,12 @@ pub enum CommandMessage {
     },
 }
 
+/// Maximum number of Gemini PTY output frames queued for the WebSocket writer
+const GEMINI_OUTPUT_QUEUE: usize = 64;
+
+/// How long to keep flushing queued Gemini output after the PTY closes
+const GEMINI_OUTPUT_DRAIN_TIMEOUT: tokio::time::Duration = tokio::time::Duration::from_secs(5);
+
 /// Create a new session
 pub async fn create_session_handler(
     State(state): State<AppState>,
@@ -210,7 +216,26 @@ async fn gemini_terminal_connection(socket: WebSocket, session_id: String, state
         return; // Exit early since process is not running
     }
 
-    let ws_sender = Arc::new(Mutex::new(ws_sender));
+    // Single writer task owns the WebSocket sink. The PTY reader hands it
+    // serialized frames over a bounded channel, so a slow client still backs
+    // up into the PTY; frames that queue up while a write is in flight are
+    // fed together and flushed once.
+    let (out_tx, mut out_rx) = tokio::sync::mpsc::channel::<String>(GEMINI_OUTPUT_QUEUE);
+    let mut writer_task = tokio::spawn(async move {
+        while let Some(json) = out_rx.recv().await {
+            if ws_sender.feed(Message::Text(json)).await.is_err() {
+                return;
+            }
+            while let Ok(json) = out_rx.try_recv() {
+                if ws_sender.feed(Message::Text(json)).await.is_err() {
+                    return;
+                }
+            }
+            if ws_sender.flush().await.is_err() {
+                return;
+            }
+        }
+    });
 
     // Get PTY reader and writer
     let gemini_for_io = gemini_arc.lock().await;
@@ -220,7 +245,6 @@ async fn gemini_terminal_connection(socket: WebSocket, session_id: String, state
 
     // Task to read from PTY and send to WebSocket
     // Note: Command detection is now handled via MCP tool calls, not text parsing
-    let ws_sender_clone = ws_sender.clone();
     let mut output_task = tokio::task::spawn_blocking(move || {
         let mut buffer = vec![0u8; 4096];
 
@@ -236,16 +260,9 @@ async fn gemini_terminal_connection(socket: WebSocket, session_id: String, state
                     let msg = TerminalMessage::Output { data: output };
                     let json = serde_json::to_string(&msg).unwrap();
 
-                    // Use blocking channel to send to async task
-                    let rt = tokio::runtime::Handle::current();
-                    let sender = ws_sender_clone.clone();
-                    if rt
-                        .block_on(async {
-                            let mut s = sender.lock().await;
-                            s.send(Message::Text(json)).await
-                        })
-                        .is_err()
-                    {
+                    // Hand off to the writer task, blocking while the queue is
+                    // full (fails once the WebSocket is gone)
+                    if out_tx.blocking_send(json).is_err() {
                         tracing::warn!("WebSocket closed, stopping Gemini PTY output");
                         break;
                     }
@@ -322,9 +339,19 @@ async fn gemini_terminal_connection(socket: WebSocket, session_id: String, state
     tokio::select! {
         _ = &mut output_task => {
             input_task.abort();
+            // Let the writer drain any output queued before the PTY closed,
+            // but don't hang on a stalled client
+            if tokio::time::timeout(GEMINI_OUTPUT_DRAIN_TIMEOUT, &mut writer_task)
+                .await
+                .is_err()
+            {
+                tracing::warn!("Timed out flushing Gemini output to WebSocket");
+                writer_task.abort();
+            }
         }
         _ = &mut input_task => {
             output_task.abort();
+            writer_task.abort();
         }
     };
 }
@@ -407,7 +434,7 @@ async fn ssh_terminal_connection(socket: WebSocket, session_id: String, state: A
                         match result {
                             Ok(Ok(Some(output))) => {
                                 // Add to session's SSH output buffer
-                                session_clone.add_ssh_output(output.clone()).await;
+                                session_clone.add_ssh_output(&output).await;
 
                                 // Send to WebSocket
                                 let msg = TerminalMessage::Output { data: output };
@@ -609,13 +636,6 @@ pub struct SshContextResponse {
     pub total_entries: usize,
 }
 
-/// Strip ANSI escape codes from text
-fn strip_ansi_codes(text: &str) -> String {
-    // Match ANSI escape sequences
-    let ansi_regex = regex::Regex::new(r"\x1B\[[0-9;]*[a-zA-Z]|\x1B\][^\x07]*\x07").unwrap();
-    ansi_regex.replace_all(text, "").replace('\r', "")
-}
-
 /// Handle SSH context retrieval request
 ///
 /// Returns recent SSH terminal output for context-aware AI interactions.
@@ -653,10 +673,9 @@ pub async fn ssh_context_handler(
     };
 
     let is_connected = session.ssh_session.is_some();
-    let buffer = session.get_ssh_context().await;
-    let total_entries = buffer.len();
+    let (all_output, total_entries) = session.get_ssh_context().await;
 
-    if buffer.is_empty() {
+    if total_entries == 0 {
         return Json(SshContextResponse {
             success: true,
             connected: is_connected,
@@ -666,11 +685,10 @@ pub async fn ssh_context_handler(
         });
     }
 
-    // Join buffer entries and get recent lines
-    let all_output = buffer.join("");
+    // Get recent lines
     let lines: Vec<&str> = all_output.lines().collect();
     let start_idx = lines.len().saturating_sub(query.lines);
-    let recent_lines: Vec<&str> = lines[start_idx..].to_vec();
+    let recent_lines = &lines[start_idx..];
 
     let context = recent_lines.join("\n");
     let line_count = recent_lines.len();